@@ -4,9 +4,15 @@
 # license information.
 # --------------------------------------------------------------------------
 """KQL Driver class."""
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import hashlib
+import os
+from pathlib import Path
 import re
-from typing import Tuple, Union, Any, Dict, Optional, Iterable
+import time
+from typing import Tuple, Union, Any, Dict, FrozenSet, Optional, Iterable
 
 import json
 import pandas as pd
@@ -39,11 +45,21 @@ from ...common.azure_auth_core import az_connect_core
 __version__ = VERSION
 __author__ = "Ian Hellen"
 
+_LA_TOKEN_SCOPE = "https://api.loganalytics.io/.default"
+# Refresh tokens this many seconds before they expire
+_TOKEN_EXPIRY_MARGIN = 300
+_AUTH_CACHE: Dict[Tuple[str, ...], Tuple[Any, Any]] = {}
+
 
 @export
 class KqlDriver(DriverBase):
     """KqlDriver class to execute kql queries."""
 
+    _SCHEMA_CACHE_DIR = Path.joinpath(
+        Path("~").expanduser(), ".msticpy", "schema_cache"
+    )
+    _SCHEMA_CACHE_TTL = timedelta(days=1)
+
     def __init__(self, connection_str: str = None, **kwargs):
         """
         Instantiaite KqlDriver and optionally connect.
@@ -53,6 +69,12 @@ class KqlDriver(DriverBase):
         connection_str : str, optional
             Connection string
 
+        Other Parameters
+        ----------------
+        result_cache_size : int, optional
+            Number of query results to keep in an in-memory cache,
+            by default 0 (caching disabled).
+
         """
         self._ip = get_ipython()
         self._debug = kwargs.get("debug", False)
@@ -65,6 +87,12 @@ class KqlDriver(DriverBase):
             self._load_kql_magic()
 
         self._schema: Dict[str, Any] = {}
+        self._schema_tables: FrozenSet[str] = frozenset()
+        self._schema_from_cache = False
+        self._result_cache: "OrderedDict[Tuple[str, bytes], pd.DataFrame]" = (
+            OrderedDict()
+        )
+        self._result_cache_max = kwargs.get("result_cache_size", 0)
 
         if connection_str:
             self.current_connection = connection_str
@@ -80,12 +108,29 @@ class KqlDriver(DriverBase):
         connection_str : str
             Connect to a data source
 
+        Other Parameters
+        ----------------
+        refresh_schema : bool, optional
+            If True, fetch the workspace schema from the service
+            even if there is a current cached copy, by default False.
+        schema_cache_ttl : Union[timedelta, int, float], optional
+            Maximum age of a cached workspace schema (as a timedelta
+            or a number of seconds), by default 1 day.
+
+        Raises
+        ------
+        TypeError
+            If `schema_cache_ttl` is not a timedelta or number.
+
         """
         if not connection_str:
             raise MsticpyKqlConnectionError(
                 "A connection string is needed to connect to Azure Sentinel.",
                 title="no connection string",
             )
+        schema_cache_ttl = _get_schema_cache_ttl(
+            kwargs.get("schema_cache_ttl", self._SCHEMA_CACHE_TTL)
+        )
         if "kqlmagic_args" in kwargs:
             connection_str = connection_str + " " + kwargs["kqlmagic_args"]
         elif "cli" in kwargs:
@@ -111,7 +156,11 @@ class KqlDriver(DriverBase):
                 except Exception as ex:  # pylint: disable=broad-except
                     self._raise_adal_error(ex)
                 self._connected = True
-                self._schema = self._get_schema()
+                self._schema = self._get_schema(
+                    refresh=kwargs.get("refresh_schema", False),
+                    cache_ttl=schema_cache_ttl,
+                )
+                self._schema_tables = frozenset(self._schema or ())
             else:
                 print(f"Could not connect to kql query provider for {connection_str}")
             return self._connected
@@ -146,6 +195,12 @@ class KqlDriver(DriverBase):
         query_source : QuerySource
             The query definition object
 
+        Other Parameters
+        ----------------
+        use_cache : bool, optional
+            If False, bypass the result cache (if enabled) and
+            re-run the query, by default True.
+
         Returns
         -------
         Union[pd.DataFrame, results.ResultSet]
@@ -153,24 +208,33 @@ class KqlDriver(DriverBase):
             the underlying provider result if an error.
 
         """
-        del kwargs
         if query_source:
-            try:
-                table = query_source["args.table"]
-            except KeyError:
-                table = None
-            if table:
-                if " " in table.strip():
-                    table = table.strip().split(" ")[0]
-                if table not in self.schema:
-                    raise MsticpyNoDataSourceError(
-                        f"The table {table} for this query is not in your workspace",
-                        " schema. Please check your workspace",
-                        title=f"{table} not found.",
-                    )
-        data, result = self.query_with_results(query)
+            self._check_table_exists(query_source)
+        data, result = self.query_with_results(
+            query, use_cache=kwargs.get("use_cache", True)
+        )
         return data if data is not None else result
 
+    def _check_table_exists(self, query_source: QuerySource):
+        """Check that query table is in the workspace schema."""
+        try:
+            table = query_source["args.table"]
+        except KeyError:
+            table = None
+        if not table:
+            return
+        table = _get_table_name(table)
+        if table not in self._schema_tables and self._schema_from_cache:
+            # The cached schema may pre-date the table - refresh it once
+            self._schema = self._get_schema(refresh=True)
+            self._schema_tables = frozenset(self._schema or ())
+        if table not in self._schema_tables:
+            raise MsticpyNoDataSourceError(
+                f"The table {table} for this query is not in your workspace",
+                " schema. Please check your workspace",
+                title=f"{table} not found.",
+            )
+
     # pylint: disable=too-many-branches
     def query_with_results(self, query: str, **kwargs) -> Tuple[pd.DataFrame, Any]:
         """
@@ -181,11 +245,18 @@ class KqlDriver(DriverBase):
         query : str
             The kql query to execute
 
+        Other Parameters
+        ----------------
+        use_cache : bool, optional
+            If False, bypass the result cache (if enabled) and
+            re-run the query, by default True.
+
         Returns
         -------
         Tuple[pd.DataFrame, results.ResultSet]
             A DataFrame (if successfull) and
-            Kql ResultSet.
+            Kql ResultSet. The ResultSet is None if the
+            DataFrame was returned from the result cache.
 
         """
         # connect or switch the connection if our connection string
@@ -199,6 +270,17 @@ class KqlDriver(DriverBase):
                 help_uri=MsticpyKqlConnectionError.DEF_HELP_URI,
             )
 
+        cache_key = None
+        if self._result_cache_max > 0 and kwargs.get("use_cache", True):
+            cache_key = (
+                self.current_connection,
+                hashlib.blake2b(query.encode(), digest_size=16).digest(),
+            )
+            if cache_key in self._result_cache:
+                self._result_cache.move_to_end(cache_key)
+                # Return a copy so that callers cannot modify the cached data
+                return self._result_cache[cache_key].copy(), None
+
         if self._debug:
             print(query)
 
@@ -222,6 +304,8 @@ class KqlDriver(DriverBase):
                 data_frame = result.to_dataframe()
                 if result.is_partial_table:
                     print("Warning - query returned partial results.")
+                elif cache_key is not None:
+                    self._add_cached_result(cache_key, data_frame)
                 return data_frame, result
 
         # Query failed
@@ -234,6 +318,16 @@ class KqlDriver(DriverBase):
         err_args.append(f"Query:\n{query}")
         raise MsticpyDataQueryError(*err_args)
 
+    def clear_cache(self):
+        """Clear the query result cache."""
+        self._result_cache.clear()
+
+    def _add_cached_result(self, cache_key: Tuple[str, bytes], data: pd.DataFrame):
+        """Add a query result to the cache, evicting the oldest entries."""
+        self._result_cache[cache_key] = data.copy()
+        while len(self._result_cache) > self._result_cache_max:
+            self._result_cache.popitem(last=False)
+
     def _load_kql_magic(self):
         """Load KqlMagic if not loaded."""
         # KqlMagic
@@ -248,8 +342,42 @@ class KqlDriver(DriverBase):
             return self._ip.find_magic("kql") is not None
         return False
 
-    def _get_schema(self) -> Dict[str, Dict]:
-        return self._ip.run_line_magic("kql", line="--schema")
+    def _get_schema(
+        self, refresh: bool = False, cache_ttl: Optional[timedelta] = None
+    ) -> Dict[str, Dict]:
+        """Return workspace schema, from the local cache if current."""
+        self._schema_from_cache = False
+        cache_file = self._get_schema_cache_file()
+        if cache_file and not refresh and cache_file.is_file():
+            cache_age = datetime.now() - datetime.fromtimestamp(
+                cache_file.stat().st_mtime
+            )
+            if cache_age < (self._SCHEMA_CACHE_TTL if cache_ttl is None else cache_ttl):
+                try:
+                    schema = json.loads(cache_file.read_text(encoding="utf-8"))
+                    self._schema_from_cache = True
+                    return schema
+                except (OSError, ValueError):
+                    pass
+        schema = self._ip.run_line_magic("kql", line="--schema")
+        if cache_file and schema:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = cache_file.with_suffix(".tmp")
+                tmp_file.write_text(json.dumps(schema, default=str), encoding="utf-8")
+                os.replace(tmp_file, cache_file)
+            except (OSError, TypeError, ValueError):
+                # Not being able to cache the schema is not fatal
+                pass
+        return schema
+
+    def _get_schema_cache_file(self) -> Optional[Path]:
+        """Return the schema cache file path for the current workspace."""
+        ws_match = re.search(self._WS_RGX, self.current_connection or "", re.IGNORECASE)
+        if not ws_match:
+            return None
+        ws_id = re.sub(r"[^\w-]", "_", ws_match.group("ws"))
+        return Path(self._SCHEMA_CACHE_DIR).joinpath(f"{ws_id}.json")
 
     def _get_kql_option(self, option):
         """Retrieve a current Kqlmagic notebook option."""
@@ -267,18 +395,21 @@ class KqlDriver(DriverBase):
     @staticmethod
     def _format_datetime(date_time: datetime) -> str:
         """Return datetime-formatted string."""
+        if date_time.tzinfo is not None:
+            # convert aware datetimes to UTC before appending the "Z" suffix
+            date_time = date_time.astimezone(timezone.utc).replace(tzinfo=None)
         return date_time.isoformat(sep="T") + "Z"
 
     @staticmethod
     def _format_list(param_list: Iterable[Any]):
         """Return formatted list parameter."""
-        fmt_list = []
-        for item in param_list:
-            if isinstance(item, str):
-                fmt_list.append(f"'{item}'")
-            else:
-                fmt_list.append(f"{item}")
-        return ",".join(fmt_list)
+        items = list(param_list)
+        if items and all(isinstance(item, str) for item in items):
+            # fast path for the common case of all-string lists
+            return "'" + "','".join(items) + "'"
+        return ",".join(
+            f"'{item}'" if isinstance(item, str) else f"{item}" for item in items
+        )
 
     _WS_RGX = r"workspace\(['\"](?P<ws>[^'\"]+)"
     _TEN_RGX = r"tenant\(['\"](?P<tenant>[^'\"]+)"
@@ -354,6 +485,25 @@ class KqlDriver(DriverBase):
         )
 
 
+def _get_schema_cache_ttl(cache_ttl: Union[timedelta, int, float]) -> timedelta:
+    """Return `cache_ttl` as a timedelta, converting from seconds."""
+    if isinstance(cache_ttl, timedelta):
+        return cache_ttl
+    if isinstance(cache_ttl, (int, float)) and not isinstance(cache_ttl, bool):
+        return timedelta(seconds=cache_ttl)
+    raise TypeError(
+        "schema_cache_ttl must be a timedelta or a number of seconds,"
+        f" not {type(cache_ttl).__name__}"
+    )
+
+
+@lru_cache(maxsize=1024)
+def _get_table_name(table: str) -> str:
+    """Return the table name from a query table expression."""
+    table = table.strip()
+    return table.split(" ", 1)[0] if " " in table else table
+
+
 def _build_auth_cnt_str(
     namespace: dict, connection_str: str, auth_types: list = None
 ) -> str:
@@ -377,11 +527,23 @@ def _build_auth_cnt_str(
     """
     if not auth_types:
         auth_types = ["cli", "msi"]
-    creds = az_connect_core(auth_methods=auth_types)
-    token = creds.modern.get_token("https://api.loganalytics.io/.default")
+    token = _get_la_token(auth_types)
     namespace["token_dict"] = {
         "access_token": token.token,
         "token_type": "Bearer",
         "resource": "https://api.loganalytics.io/",
     }
     return connection_str + " " + "-try_token=locals()['token_dict']"
+
+
+def _get_la_token(auth_types: list):
+    """Return a Log Analytics token, reusing cached credentials and token."""
+    cache_key = tuple(auth_types)
+    creds, token = _AUTH_CACHE.get(cache_key, (None, None))
+    if token is not None and token.expires_on > time.time() + _TOKEN_EXPIRY_MARGIN:
+        return token
+    if creds is None:
+        creds = az_connect_core(auth_methods=auth_types)
+    token = creds.modern.get_token(_LA_TOKEN_SCOPE)
+    _AUTH_CACHE[cache_key] = (creds, token)
+    return token
@@ -126,7 +126,6 @@ class SplunkDriver(DriverBase):
                 help_uri="https://msticpy.readthedocs.io/en/latest/DataProviders.html",
             ) from err
         self._connected = True
-        print("connected")
 
     def _get_connect_args(
         self, connection_str: Optional[str], **kwargs
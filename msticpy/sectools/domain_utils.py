@@ -10,40 +10,71 @@ Includes functions to conduct common investigation steps when dealing
 with a domain or url, such as getting a screenshot or validating the TLD.
 
 """
-from datetime import datetime
-from enum import Enum
-import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import csv
+from datetime import datetime, timedelta
+from functools import lru_cache
+import io
+import os
+from pathlib import Path
+import socket
 import ssl
+import threading
 import time
-from typing import Any, Dict, Optional, Tuple
-from urllib.error import HTTPError, URLError
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-import cryptography as crypto
 import pandas as pd
 import requests
-import tldextract
 
 # pylint: disable=no-name-in-module
 from dns.resolver import Resolver
 from dns.exception import DNSException
 
+try:
+    from dns.asyncresolver import Resolver as AsyncResolver
+except ImportError:
+    # dnspython 1.x has no async resolver
+    AsyncResolver = None
+
 # pylint: enable=no-name-in-module
-from IPython import display
-from ipywidgets import IntProgress
 from urllib3.exceptions import LocationParseError
-from urllib3.util import parse_url
+from urllib3.util import Url, parse_url
 
 from .._version import VERSION
 from ..common import pkg_config as config
 from ..common.exceptions import MsticpyUserConfigError
-from ..common.utility import export
+from ..common.utility import export, is_ipython
+
+if TYPE_CHECKING:
+    from tldextract.tldextract import ExtractResult
 
 __version__ = VERSION
 __author__ = "Pete Bryan"
 
 
+_BS_PROGRESS_MAX = 40
+_BS_POLL_MIN_DELAY = 0.1
+_BS_POLL_MAX_DELAY = 2.0
+_BS_POOL_SIZE = 10
+
+_bs_session: Optional[requests.Session] = None
+
+
 @export
-def screenshot(url: str, api_key: str = None) -> requests.models.Response:
+def screenshot(
+    url: str, api_key: str = None, max_wait: float = 60
+) -> requests.models.Response:
     """
     Get a screenshot of a url with Browshot.
 
@@ -53,6 +84,9 @@ def screenshot(url: str, api_key: str = None) -> requests.models.Response:
         The url a screenshot is wanted for.
     api_key : str (optional)
         Browshot API key. If not set msticpyconfig checked for this.
+    max_wait : float (optional)
+        Maximum time in seconds to wait for the screenshot
+        to complete, by default 60.
 
     Returns
     -------
@@ -83,38 +117,102 @@ def screenshot(url: str, api_key: str = None) -> requests.models.Response:
             browshot_uri=("Get an API key for Browshot", "https://api.browshot.com/"),
         )
 
+    image_data = _get_screenshot(_get_bs_session(), url, bs_api_key, max_wait)
+
+    if image_data.status_code != 200:
+        print(
+            "There was a problem with the request, please check the status code for details"
+        )
+
+    return image_data
+
+
+def _get_bs_session() -> requests.Session:
+    """Return the shared Browshot session, creating it if needed."""
+    # All screenshot requests go to the same host so keep a single
+    # session (and connection pool) alive for the whole process.
+    global _bs_session  # pylint: disable=global-statement
+    if _bs_session is None:
+        session = requests.Session()
+        session.mount(
+            "https://", requests.adapters.HTTPAdapter(pool_maxsize=_BS_POOL_SIZE)
+        )
+        _bs_session = session
+    return _bs_session
+
+
+class _NoProgress:
+    """Progress stand-in used outside of IPython."""
+
+    value = 0
+
+
+def _make_progress(max_value: int):
+    """Return a displayed progress bar widget or a no-op outside IPython."""
+    if is_ipython():
+        try:
+            # pylint: disable=import-outside-toplevel
+            from IPython import display
+            from ipywidgets import IntProgress
+
+            # pylint: enable=import-outside-toplevel
+        except ImportError:
+            return _NoProgress()
+        progress = IntProgress(min=0, max=max_value)
+        display.display(progress)
+        return progress
+    return _NoProgress()
+
+
+def _get_screenshot(
+    session: requests.Session, url: str, bs_api_key: str, max_wait: float
+) -> requests.models.Response:
+    """Request screenshot from Browshot, wait for it and return the image."""
     # Request screenshot from Browshot and get request ID
     id_string = f"https://api.browshot.com/api/v1/screenshot/create?url={url}/&instance_id=26&size=screen&cache=0&key={bs_api_key}"  # pylint: disable=line-too-long
-    id_data = requests.get(id_string)
-    bs_id = json.loads(id_data.content)["id"]
+    id_data = session.get(id_string)
+    bs_id = id_data.json()["id"]
     status_string = (
         f"https://api.browshot.com/api/v1/screenshot/info?id={bs_id}&key={bs_api_key}"
     )
     image_string = f"https://api.browshot.com/api/v1/screenshot/thumbnail?id={bs_id}&zoom=50&key={bs_api_key}"  # pylint: disable=line-too-long
     # Wait until the screenshot is ready and keep user updated with progress
     print("Getting screenshot")
-    progress = IntProgress(min=0, max=40)
-    display.display(progress)
-    ready = False
-    while not ready:
-        progress.value += 1
-        status_data = requests.get(status_string)
-        status = json.loads(status_data.content)["status"]
-        if status == "finished":
-            ready = True
-        else:
-            time.sleep(0.05)
-    progress.value = 40
+    progress = _make_progress(_BS_PROGRESS_MAX)
+    # Poll with exponential backoff, tracking progress against elapsed time
+    delay = _BS_POLL_MIN_DELAY
+    start = time.monotonic()
+    while True:
+        status_data = session.get(status_string)
+        status = status_data.json()["status"]
+        elapsed = time.monotonic() - start
+        if status in ("finished", "error") or elapsed >= max_wait:
+            break
+        progress.value = int(_BS_PROGRESS_MAX * min(elapsed / max_wait, 1))
+        time.sleep(delay)
+        delay = min(delay * 2, _BS_POLL_MAX_DELAY)
+    progress.value = _BS_PROGRESS_MAX
+    if status != "finished":
+        print(f"Screenshot not completed - status: {status}")
 
     # Once ready get the screenshot
-    image_data = requests.get(image_string)
+    return session.get(image_string)
 
-    if image_data.status_code != 200:
-        print(
-            "There was a problem with the request, please check the status code for details"
-        )
 
-    return image_data
+@lru_cache(maxsize=None)
+def _get_tld_extractor():
+    """Return the shared TLDExtract instance, importing tldextract on first use."""
+    import tldextract  # pylint: disable=import-outside-toplevel
+
+    # Use the public suffix list snapshot bundled with tldextract rather
+    # than fetching the latest list on first use.
+    return tldextract.TLDExtract(suffix_list_urls=())
+
+
+@lru_cache(maxsize=131072)
+def _cached_extract(domain: str) -> "ExtractResult":
+    """Return memoized tldextract result for `domain`."""
+    return _get_tld_extractor()(domain)
 
 
 # Backward compat with dnspython 1.x
@@ -131,13 +229,48 @@ else:
 class DomainValidator:
     """Assess a domain's validity."""
 
-    _ssl_abuse_list: pd.DataFrame = pd.DataFrame()
+    _SSL_ABUSE_URL = "https://sslbl.abuse.ch/blacklist/sslblacklist.csv"
+    _SSL_ABUSE_CACHE = Path.joinpath(
+        Path("~").expanduser(), ".msticpy", "cache", "sslblacklist.csv"
+    )
+    _SSL_ABUSE_CACHE_TTL = timedelta(hours=6)
+    # Seconds to wait before retrying a failed abuse list download
+    _SSL_ABUSE_RETRY_DELAY = 60
+
+    _loaded: bool = False
+    _load_failed_at: Optional[float] = None
+    _ssl_abuse_csv: str = ""
+    _ssl_abuse_list: Optional[pd.DataFrame] = None
+    _ssl_abuse_set: FrozenSet[bytes] = frozenset()
+    _ssl_abuse_set_hex: FrozenSet[str] = frozenset()
+    _abuse_lock = threading.Lock()
 
     @classmethod
     def _check_and_load_abuselist(cls):
-        """Pull IANA TLD list and save to internal attribute."""
-        if cls._ssl_abuse_list is None or cls._ssl_abuse_list.empty:
-            cls._ssl_abuse_list: pd.DataFrame = cls._get_ssl_abuselist()
+        """Pull SSL Abuse List and index the SHA1 fingerprints."""
+        if not cls._loaded and not cls._abuselist_retry_pending():
+            # Re-check inside the lock so that only one thread downloads
+            with cls._abuse_lock:
+                if not cls._loaded and not cls._abuselist_retry_pending():
+                    abuse_csv = cls._get_ssl_abuselist_csv()
+                    cls._ssl_abuse_set = _parse_abuselist_sha1(abuse_csv)
+                    cls._ssl_abuse_set_hex = frozenset(
+                        fingerprint.hex() for fingerprint in cls._ssl_abuse_set
+                    )
+                    cls._ssl_abuse_csv = abuse_csv
+                    cls._ssl_abuse_list = None
+                    # No fingerprints means the download failed - try again
+                    # after a short delay rather than caching an empty list.
+                    cls._loaded = bool(cls._ssl_abuse_set)
+                    cls._load_failed_at = None if cls._loaded else time.monotonic()
+
+    @classmethod
+    def _abuselist_retry_pending(cls) -> bool:
+        """Return True if a failed abuse list load should not yet be retried."""
+        return (
+            cls._load_failed_at is not None
+            and time.monotonic() - cls._load_failed_at < cls._SSL_ABUSE_RETRY_DELAY
+        )
 
     @property
     def ssl_abuse_list(self) -> pd.DataFrame:
@@ -151,7 +284,39 @@ class DomainValidator:
 
         """
         self._check_and_load_abuselist()
-        return self._ssl_abuse_list
+        cls = type(self)
+        if cls._ssl_abuse_list is None:
+            # Only build the DataFrame if someone asks for it
+            with cls._abuse_lock:
+                if cls._ssl_abuse_list is None:
+                    cls._ssl_abuse_list = (
+                        pd.read_csv(io.StringIO(cls._ssl_abuse_csv), skiprows=8)
+                        if cls._ssl_abuse_csv
+                        else pd.DataFrame({"SHA1": []})
+                    )
+        return cls._ssl_abuse_list
+
+    @classmethod
+    def mark_in_abuse_list(cls, sha1_series: pd.Series) -> pd.Series:
+        """
+        Check a series of certificate SHA1 hashes against the SSL Abuse List.
+
+        Parameters
+        ----------
+        sha1_series : pd.Series
+            Series of hex-encoded SHA1 certificate fingerprints.
+
+        Returns
+        -------
+        pd.Series
+            Boolean series - True where the fingerprint is in the list.
+
+        """
+        cls._check_and_load_abuselist()
+        # astype(str) so that all-null (float) and empty series work
+        return sha1_series.notna() & sha1_series.astype(str).str.lower().isin(
+            cls._ssl_abuse_set_hex
+        )
 
     @staticmethod
     def validate_tld(url_domain: str) -> bool:
@@ -169,7 +334,13 @@ class DomainValidator:
             True if valid public TLD, False if not.
 
         """
-        _, _, tld = tldextract.extract(url_domain.lower())
+        # Cheap checks for values that cannot have a public suffix:
+        # no dot separator, or a dotted-decimal/IPv6-style IP address.
+        if "." not in url_domain or (
+            url_domain.replace(".", "").replace(":", "").isdigit()
+        ):
+            return False
+        _, _, tld = _cached_extract(url_domain.lower())
         return bool(tld)
 
     @staticmethod
@@ -187,11 +358,19 @@ class DomainValidator:
         result:
             True if valid resolvable, False if not.
 
+        Notes
+        -----
+        This uses the system resolver, so names in the hosts file and
+        names with only AAAA (IPv6) records are resolvable. There is no
+        timeout beyond the one configured for the system resolver.
+
         """
+        # Use the system resolver (and its cache) - we only need to
+        # know whether the name resolves, not the DNS response details.
         try:
-            _dns_resolve(url_domain, "A")
+            socket.getaddrinfo(url_domain, None, proto=socket.IPPROTO_TCP)
             return True
-        except DNSException:
+        except (socket.gaierror, UnicodeError):
             return False
 
     def in_abuse_list(self, url_domain: str) -> Tuple:
@@ -209,21 +388,24 @@ class DomainValidator:
             True if valid in the list, False if not.
 
         """
+        return self._cert_in_abuse_list(url_domain)
+
+    @classmethod
+    def _cert_in_abuse_list(cls, url_domain: str) -> Tuple:
+        """Return whether `url_domain` SSL cert is in the list and the cert."""
+        # pylint: disable=import-outside-toplevel
+        from cryptography.hazmat.primitives.hashes import SHA1
+        from cryptography.x509 import load_pem_x509_certificate
+
+        # pylint: enable=import-outside-toplevel
         try:
             cert = ssl.get_server_certificate((url_domain, 443))
             # pylint: disable=no-value-for-parameter
-            x509 = crypto.x509.load_pem_x509_certificate(  # type: ignore
-                cert.encode("ascii")
-            )
+            x509 = load_pem_x509_certificate(cert.encode("ascii"))  # type: ignore
             # pylint: enable=no-value-for-parameter
-            cert_sha1 = x509.fingerprint(
-                crypto.hazmat.primitives.hashes.SHA1()  # type: ignore # nosec
-            )
-            result = bool(
-                self.ssl_abuse_list["SHA1"]
-                .str.contains(cert_sha1.hex())
-                .any()  # type: ignore
-            )
+            cert_sha1 = x509.fingerprint(SHA1())  # type: ignore # nosec
+            cls._check_and_load_abuselist()
+            result = cert_sha1 in cls._ssl_abuse_set
         except Exception:  # pylint: disable=broad-except
             result = False
             x509 = None
@@ -231,16 +413,119 @@ class DomainValidator:
         return result, x509
 
     @classmethod
-    def _get_ssl_abuselist(cls) -> pd.DataFrame:
-        """Download and load abuse.ch SSL Abuse List."""
-        try:
-            ssl_ab_list = pd.read_csv(
-                "https://sslbl.abuse.ch/blacklist/sslblacklist.csv", skiprows=8
+    def validate_many(
+        cls, url_domains: Iterable[str], max_workers: int = 16
+    ) -> pd.DataFrame:
+        """
+        Run TLD, DNS and SSL Abuse List checks for multiple domains.
+
+        Parameters
+        ----------
+        url_domains : Iterable[str]
+            The domains to validate.
+        max_workers : int, optional
+            The maximum number of concurrent name lookups and
+            certificate fetches, by default 16.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with one row per domain and boolean
+            columns "tld_valid", "resolvable" and "in_abuse_list".
+
+        Notes
+        -----
+        The "resolvable" column has the same meaning as `is_resolvable`.
+        Domains that cannot be resolved are not checked against
+        the SSL Abuse List.
+
+        """
+        results = pd.DataFrame({"domain": list(url_domains)})
+        results["tld_valid"] = results["domain"].map(cls.validate_tld)
+        results["in_abuse_list"] = False
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results["resolvable"] = list(
+                executor.map(cls.is_resolvable, results["domain"])
             )
-        except (ConnectionError, HTTPError, URLError):
-            ssl_ab_list = pd.DataFrame({"SHA1": []})
+            resolvable = results.loc[results["resolvable"], "domain"]
+            if not resolvable.empty:
+                cls._check_and_load_abuselist()
+                in_abuse = executor.map(cls._cert_in_abuse_list, resolvable)
+                results.loc[resolvable.index, "in_abuse_list"] = [
+                    result for result, _ in in_abuse
+                ]
+        return results[["domain", "tld_valid", "resolvable", "in_abuse_list"]]
+
+    @classmethod
+    def _get_ssl_abuselist_csv(cls) -> str:
+        """Download abuse.ch SSL Abuse List and return the CSV text."""
+        cache_file = cls._SSL_ABUSE_CACHE
+        if not cls._abuselist_cache_expired(cache_file):
+            abuse_csv = _read_cache_text(cache_file)
+            if _parse_abuselist_sha1(abuse_csv):
+                return abuse_csv
+        try:
+            resp = requests.get(cls._SSL_ABUSE_URL)
+            resp.raise_for_status()
+        except requests.RequestException:
+            resp = None
+        if resp is None or not _parse_abuselist_sha1(resp.text):
+            # Failed download or not the abuse list (e.g. a proxy page)
+            # - fall back to any usable stale copy rather than an empty list
+            abuse_csv = _read_cache_text(cache_file)
+            return abuse_csv if _parse_abuselist_sha1(abuse_csv) else ""
+
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file so readers never see a partial list
+            tmp_file = cache_file.with_suffix(".tmp")
+            tmp_file.write_text(resp.text, encoding="utf-8")
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            # Not being able to cache the list is not fatal
+            pass
+        return resp.text
+
+    @classmethod
+    def _abuselist_cache_expired(cls, cache_file: Path) -> bool:
+        """Return True if the cached abuse list is missing or too old."""
+        if not cache_file.is_file():
+            return True
+        cache_age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
+        return cache_age > cls._SSL_ABUSE_CACHE_TTL
+
 
-        return ssl_ab_list
+def _read_cache_text(cache_file: Path) -> str:
+    """Return the text of `cache_file` or "" if it is missing or unreadable."""
+    try:
+        return cache_file.read_text(encoding="utf-8")
+    except (OSError, ValueError):
+        return ""
+
+
+@lru_cache(maxsize=4)
+def _parse_abuselist_sha1(abuse_csv: str) -> FrozenSet[bytes]:
+    """Return the set of SHA1 fingerprints (as bytes) in the abuse list CSV."""
+    sha1_idx = None
+    fingerprints = set()
+    for row in csv.reader(io.StringIO(abuse_csv)):
+        if not row:
+            continue
+        if row[0].startswith("#"):
+            # The column header is the last of the comment lines
+            columns = [col.strip("# ") for col in row]
+            if "SHA1" in columns:
+                sha1_idx = columns.index("SHA1")
+            continue
+        if sha1_idx is None or len(row) <= sha1_idx:
+            continue
+        try:
+            fingerprint = bytes.fromhex(row[sha1_idx])
+        except ValueError:
+            continue
+        if len(fingerprint) == 20:
+            fingerprints.add(fingerprint)
+    return frozenset(fingerprints)
 
 
 def dns_components(domain: str) -> dict:
@@ -258,15 +543,28 @@ def dns_components(domain: str) -> dict:
         Returns subdomain and TLD components from a domain.
 
     """
-    return tldextract.extract(domain.lower())._asdict()
+    return _cached_extract(domain.lower())._asdict()
 
 
 def url_components(url: str) -> Dict[str, str]:
     """Return parsed Url components as dict."""
+    parsed_url = _cached_parse_url(url)
+    return parsed_url._asdict() if parsed_url else {}
+
+
+@lru_cache(maxsize=65536)
+def _cached_parse_url(url: str) -> Optional[Url]:
+    """Return memoized parse_url result or None if `url` cannot be parsed."""
     try:
-        return parse_url(url)._asdict()
+        return parse_url(url)
     except LocationParseError:
-        return {}
+        return None
+
+
+def _get_host(url_domain: str) -> str:
+    """Return the host part of `url_domain`."""
+    parsed_url = _cached_parse_url(url_domain)
+    return parsed_url.host if parsed_url and parsed_url.host else url_domain
 
 
 def dns_resolve(url_domain: str, rec_type: str = "A") -> Dict[str, Any]:
@@ -286,7 +584,7 @@ def dns_resolve(url_domain: str, rec_type: str = "A") -> Dict[str, Any]:
         Resolver result as dictionary.
 
     """
-    domain = parse_url(url_domain).host
+    domain = _get_host(url_domain)
     try:
         return _resolve_resp_to_dict(_dns_resolve(domain, rdtype=rec_type))
     except DNSException as err:
@@ -297,6 +595,135 @@ def dns_resolve(url_domain: str, rec_type: str = "A") -> Dict[str, Any]:
         }
 
 
+def dns_resolve_df(
+    url_domain: Union[str, Iterable[str]], rec_type: str = "A"
+) -> pd.DataFrame:
+    """
+    Resolve one or more domains or URLs, returning results as a DataFrame.
+
+    Parameters
+    ----------
+    url_domain : Union[str, Iterable[str]]
+        The url or domain (or an iterable of these) to resolve.
+    rec_type : str
+        The DNS record type to query, by default "A"
+
+    Returns
+    -------
+    pd.DataFrame
+        Resolver results with one row per returned record.
+
+    """
+    if isinstance(url_domain, str):
+        url_domain = [url_domain]
+    return _resolve_results_to_df(
+        [dns_resolve(domain, rec_type) for domain in url_domain]
+    )
+
+
+def dns_resolve_bulk(
+    url_domains: Iterable[str], rec_type: str = "A", concurrency: int = 64
+) -> List[Dict[str, Any]]:
+    """
+    Resolve multiple domains or URLs concurrently.
+
+    Parameters
+    ----------
+    url_domains : Iterable[str]
+        The urls or domains to resolve.
+    rec_type : str
+        The DNS record type to query, by default "A"
+    concurrency : int
+        The maximum number of queries in flight at once, by default 64
+
+    Returns
+    -------
+    List[Dict[str, Any]]:
+        Resolver results as dictionaries, in the same order as
+        `url_domains`.
+
+    Raises
+    ------
+    ValueError
+        If `concurrency` is less than 1.
+
+    Notes
+    -----
+    Requires dnspython 2.x. With earlier versions, the queries are
+    run sequentially.
+
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, not {concurrency}")
+    if AsyncResolver is None:
+        return [dns_resolve(url_domain, rec_type) for url_domain in url_domains]
+    return _run_sync(_dns_resolve_bulk_async(list(url_domains), rec_type, concurrency))
+
+
+def dns_resolve_bulk_df(
+    url_domains: Iterable[str], rec_type: str = "A", concurrency: int = 64
+) -> pd.DataFrame:
+    """
+    Resolve multiple domains or URLs concurrently, returning a DataFrame.
+
+    Parameters
+    ----------
+    url_domains : Iterable[str]
+        The urls or domains to resolve.
+    rec_type : str
+        The DNS record type to query, by default "A"
+    concurrency : int
+        The maximum number of queries in flight at once, by default 64
+
+    Returns
+    -------
+    pd.DataFrame
+        Resolver results with one row per returned record.
+
+    """
+    return _resolve_results_to_df(
+        dns_resolve_bulk(url_domains, rec_type=rec_type, concurrency=concurrency)
+    )
+
+
+async def _dns_resolve_bulk_async(
+    url_domains: List[str], rec_type: str, concurrency: int
+) -> List[Dict[str, Any]]:
+    """Resolve `url_domains` with at most `concurrency` queries pending."""
+    resolver = AsyncResolver()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _resolve_one(url_domain: str) -> Dict[str, Any]:
+        domain = _get_host(url_domain)
+        async with semaphore:
+            try:
+                return _resolve_resp_to_dict(
+                    await resolver.resolve(domain, rdtype=rec_type)
+                )
+            except DNSException as err:
+                return {
+                    "qname": domain,
+                    "rdtype": rec_type,
+                    "response": str(err),
+                }
+
+    return await asyncio.gather(
+        *[_resolve_one(url_domain) for url_domain in url_domains]
+    )
+
+
+def _run_sync(coro):
+    """Run a coroutine to completion, even if an event loop is running."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # An event loop is already running (e.g. in Jupyter), so
+    # run the coroutine in its own loop on a separate thread.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
 def ip_rev_resolve(ip_address: str) -> Dict[str, Any]:
     """
     Reverse lookup for IP Address.
@@ -322,18 +749,45 @@ def ip_rev_resolve(ip_address: str) -> Dict[str, Any]:
         }
 
 
+def ip_rev_resolve_df(ip_address: Union[str, Iterable[str]]) -> pd.DataFrame:
+    """
+    Reverse lookup for one or more IP Addresses, returning a DataFrame.
+
+    Parameters
+    ----------
+    ip_address : Union[str, Iterable[str]]
+        The IP address (or an iterable of addresses) to query.
+
+    Returns
+    -------
+    pd.DataFrame
+        Resolver results with one row per returned record.
+
+    """
+    if isinstance(ip_address, str):
+        ip_address = [ip_address]
+    return _resolve_results_to_df([ip_rev_resolve(addr) for addr in ip_address])
+
+
+def _resolve_results_to_df(results) -> pd.DataFrame:
+    """Return list of resolver result dicts as a DataFrame."""
+    # Expand each record in the rrset to its own row up front rather
+    # than creating the DataFrame with list values and exploding it.
+    rows: List[Dict[str, Any]] = []
+    for result in results:
+        rrset = result.get("rrset")
+        if rrset:
+            rows.extend({**result, "rrset": record} for record in rrset)
+        else:
+            rows.append(result)
+    return pd.DataFrame(rows)
+
+
 def _resolve_resp_to_dict(resolver_resp):
     """Return Dns Python resolver response to dict."""
-    rdtype = (
-        resolver_resp.rdtype.name
-        if isinstance(resolver_resp.rdtype, Enum)
-        else str(resolver_resp.rdtype)
-    )
-    rdclass = (
-        resolver_resp.rdclass.name
-        if isinstance(resolver_resp.rdclass, Enum)
-        else str(resolver_resp.rdclass)
-    )
+    # dnspython 2.x returns enums, 1.x returns ints
+    rdtype = getattr(resolver_resp.rdtype, "name", None) or str(resolver_resp.rdtype)
+    rdclass = getattr(resolver_resp.rdclass, "name", None) or str(resolver_resp.rdclass)
 
     return {
         "qname": str(resolver_resp.qname),
@@ -343,6 +797,6 @@ def _resolve_resp_to_dict(resolver_resp):
         "nameserver": getattr(resolver_resp, "nameserver", None),
         "port": getattr(resolver_resp, "port", None),
         "canonical_name": str(resolver_resp.canonical_name),
-        "rrset": [str(res) for res in resolver_resp.rrset],
+        "rrset": list(map(str, resolver_resp.rrset)),
         "expiration": datetime.utcfromtimestamp(resolver_resp.expiration),
     }
@@ -5,10 +5,14 @@
 # --------------------------------------------------------------------------
 """datq query test class."""
 from contextlib import redirect_stdout
+from datetime import datetime, timedelta, timezone
 import io
-from unittest.mock import patch
+import sys
+import time
+from unittest.mock import MagicMock, patch
 
 import pytest
+import numpy as np
 import pytest_check as check
 import pandas as pd
 
@@ -282,3 +286,216 @@ def test_kql_query_no_table(get_ipython):
         kql_driver.query("test query", query_source=query_source)
 
     check.is_in("table3 not found.", mp_ex.value.args)
+
+    query_source = {"args.table": "table1 | where field1 == 1"}
+    result_df = kql_driver.query("test query", query_source=query_source)
+    check.is_instance(result_df, pd.DataFrame)
+
+
+@patch(GET_IPYTHON_PATCH)
+def test_kql_schema_cache(get_ipython, monkeypatch, tmp_path):
+    """Check schema is read from the local cache on reconnect."""
+    mock_ip = _MockIPython()
+    schema_calls = []
+
+    def _count_schema(magic, line):
+        if line == "--schema":
+            schema_calls.append(line)
+        return _MockIPython._run_magic(magic, line)
+
+    mock_ip.run_line_magic = _count_schema
+    get_ipython.return_value = mock_ip
+    monkeypatch.setattr(KqlDriver, "_SCHEMA_CACHE_DIR", tmp_path)
+    conn_str = "la://connection.workspace('1234-5678').tenant('abcd')"
+
+    kql_driver = KqlDriver()
+    kql_driver.connect(connection_str=conn_str)
+    check.equal(len(schema_calls), 1)
+    check.is_true(tmp_path.joinpath("1234-5678.json").is_file())
+
+    kql_driver = KqlDriver()
+    kql_driver.connect(connection_str=conn_str)
+    check.equal(len(schema_calls), 1)
+    check.is_in("table1", kql_driver.schema)
+    check.is_in("field1", kql_driver.schema["table1"])
+
+    kql_driver.connect(connection_str=conn_str, refresh_schema=True)
+    check.equal(len(schema_calls), 2)
+
+
+@patch(KqlDriver.__module__ + ".az_connect_core")
+def test_kql_auth_token_reuse(az_connect, monkeypatch):
+    """Check credentials and token are reused until the token expires."""
+    kql_module = sys.modules[KqlDriver.__module__]
+    monkeypatch.setattr(kql_module, "_AUTH_CACHE", {})
+    token = MagicMock(token="token1", expires_on=time.time() + 3600)
+    az_connect.return_value.modern.get_token.return_value = token
+
+    namespace = {}
+    kql_module._build_auth_cnt_str(namespace, "la://connection", ["cli"])
+    kql_module._build_auth_cnt_str(namespace, "la://connection", ["cli"])
+    check.equal(az_connect.call_count, 1)
+    check.equal(az_connect.return_value.modern.get_token.call_count, 1)
+    check.equal(namespace["token_dict"]["access_token"], "token1")
+
+    token.expires_on = time.time()
+    kql_module._build_auth_cnt_str(namespace, "la://connection", ["cli"])
+    check.equal(az_connect.call_count, 1)
+    check.equal(az_connect.return_value.modern.get_token.call_count, 2)
+
+
+@patch(GET_IPYTHON_PATCH)
+def test_kql_query_result_cache(get_ipython):
+    """Check repeated queries are returned from the result cache."""
+    mock_ip = _MockIPython()
+    query_calls = []
+
+    def _count_query(magic, line, cell):
+        if magic == "kql" and "test query" in cell:
+            query_calls.append(cell)
+        return _MockIPython._run_magic(magic, cell or line)
+
+    mock_ip.run_cell_magic = _count_query
+    get_ipython.return_value = mock_ip
+    kql_driver = KqlDriver(result_cache_size=2)
+    kql_driver.connect(connection_str="la://connection")
+
+    result_df = kql_driver.query("test query")
+    check.is_instance(result_df, pd.DataFrame)
+    result_df = kql_driver.query("test query")
+    check.is_instance(result_df, pd.DataFrame)
+    check.equal(len(query_calls), 1)
+
+    kql_driver.query("test query", use_cache=False)
+    check.equal(len(query_calls), 2)
+
+    # partial results are not cached
+    kql_driver.query("test query_partial")
+    kql_driver.query("test query_partial")
+    check.equal(len(query_calls), 4)
+
+    # oldest entry is evicted when the cache is full
+    kql_driver.query("test query 2")
+    kql_driver.query("test query 3")
+    kql_driver.query("test query")
+    check.equal(len(query_calls), 7)
+
+    kql_driver.clear_cache()
+    kql_driver.query("test query 3")
+    check.equal(len(query_calls), 8)
+
+
+def test_kql_format_datetime():
+    """Check datetimes are formatted as UTC."""
+    naive_dt = datetime(2021, 3, 4, 5, 6, 7, 123456)
+    check.equal(KqlDriver._format_datetime(naive_dt), "2021-03-04T05:06:07.123456Z")
+    aware_dt = datetime(
+        2021, 3, 4, 7, 6, 7, 123456, tzinfo=timezone(timedelta(hours=2))
+    )
+    check.equal(KqlDriver._format_datetime(aware_dt), "2021-03-04T05:06:07.123456Z")
+
+
+@patch(GET_IPYTHON_PATCH)
+def test_kql_schema_cache_stale_table(get_ipython, monkeypatch, tmp_path):
+    """Check a cached schema is refreshed once if a query table is missing."""
+    mock_ip = _MockIPython()
+    schema_calls = []
+
+    def _count_schema(magic, line):
+        if line == "--schema":
+            schema_calls.append(line)
+            schema = _MockIPython._run_magic(magic, line)
+            if len(schema_calls) > 1:
+                schema["table3"] = {"field1": int}
+            return schema
+        return _MockIPython._run_magic(magic, line)
+
+    mock_ip.run_line_magic = _count_schema
+    get_ipython.return_value = mock_ip
+    monkeypatch.setattr(KqlDriver, "_SCHEMA_CACHE_DIR", tmp_path)
+    conn_str = "la://connection.workspace('1234-5678').tenant('abcd')"
+
+    KqlDriver().connect(connection_str=conn_str)
+    kql_driver = KqlDriver()
+    kql_driver.connect(connection_str=conn_str)
+    check.equal(len(schema_calls), 1)
+
+    # table3 is not in the cached schema but is in the refreshed one
+    query_source = {"args.table": "table3"}
+    result_df = kql_driver.query("test query", query_source=query_source)
+    check.is_instance(result_df, pd.DataFrame)
+    check.equal(len(schema_calls), 2)
+
+    # schema is not refreshed again for unknown tables
+    with pytest.raises(MsticpyNoDataSourceError):
+        kql_driver.query("test query", query_source={"args.table": "table4"})
+    check.equal(len(schema_calls), 2)
+
+
+@patch(GET_IPYTHON_PATCH)
+def test_kql_query_result_cache_copy(get_ipython):
+    """Check changes to returned DataFrames do not alter cached results."""
+    mock_ip = _MockIPython()
+    result = KqlResultTest()
+    result.to_dataframe = lambda: pd.DataFrame({"col1": [1, 2, 3]})
+
+    def _run_query(magic, line, cell):
+        if magic == "kql" and "test query" in cell:
+            return result
+        return _MockIPython._run_magic(magic, cell or line)
+
+    mock_ip.run_cell_magic = _run_query
+    get_ipython.return_value = mock_ip
+    kql_driver = KqlDriver(result_cache_size=2)
+    kql_driver.connect(connection_str="la://connection")
+
+    result_df = kql_driver.query("test query")
+    result_df.loc[result_df["col1"] > 1, "col1"] = 0
+    result_df = kql_driver.query("test query")
+    check.equal(list(result_df["col1"]), [1, 2, 3])
+    result_df.loc[:, "col1"] = 0
+    result_df = kql_driver.query("test query")
+    check.equal(list(result_df["col1"]), [1, 2, 3])
+
+    # returned frames must not share data with the cached frame
+    cached_df = next(iter(kql_driver._result_cache.values()))
+    check.is_false(
+        np.shares_memory(result_df["col1"].to_numpy(), cached_df["col1"].to_numpy())
+    )
+
+
+@patch(GET_IPYTHON_PATCH)
+def test_kql_schema_cache_ttl(get_ipython, monkeypatch, tmp_path):
+    """Check schema_cache_ttl accepts zero, seconds and rejects other types."""
+    mock_ip = _MockIPython()
+    schema_calls = []
+
+    def _count_schema(magic, line):
+        if line == "--schema":
+            schema_calls.append(line)
+        return _MockIPython._run_magic(magic, line)
+
+    mock_ip.run_line_magic = _count_schema
+    get_ipython.return_value = mock_ip
+    monkeypatch.setattr(KqlDriver, "_SCHEMA_CACHE_DIR", tmp_path)
+    conn_str = "la://connection.workspace('1234-5678').tenant('abcd')"
+
+    kql_driver = KqlDriver()
+    kql_driver.connect(connection_str=conn_str)
+    check.equal(len(schema_calls), 1)
+
+    # a zero TTL always fetches the schema
+    kql_driver.connect(connection_str=conn_str, schema_cache_ttl=timedelta(0))
+    check.equal(len(schema_calls), 2)
+
+    # numbers are treated as seconds
+    kql_driver.connect(connection_str=conn_str, schema_cache_ttl=3600)
+    check.equal(len(schema_calls), 2)
+    kql_driver.connect(connection_str=conn_str, schema_cache_ttl=0.0)
+    check.equal(len(schema_calls), 3)
+
+    kql_driver = KqlDriver()
+    with pytest.raises(TypeError):
+        kql_driver.connect(connection_str=conn_str, schema_cache_ttl="1 day")
+    check.is_false(kql_driver.connected)
+    check.equal(len(schema_calls), 3)
@@ -126,7 +126,7 @@ def test_splunk_connect_no_params(splunk_client):
 
     with pytest.raises(MsticpyUserConfigError) as mp_ex:
         sp_driver.connect()
-        check.is_false(sp_driver.connected)
+    check.is_false(sp_driver.connected)
     check.is_in("no Splunk connection parameters", mp_ex.value.args)
 
 
@@ -159,25 +159,21 @@ def test_splunk_connect_errors(splunk_client):
     sp_driver = SplunkDriver()
     check.is_true(sp_driver.loaded)
 
-    print("connected", sp_driver.connected)
     with pytest.raises(MsticpyConnectionError) as mp_ex:
         # [SuppressMessage("Microsoft.Security", "CS002:SecretInNextLine", Justification="Test code")]
         sp_driver.connect(
             host="AuthError", username="ian", password=_FAKE_STRING
         )  # nosec
-        print("connected", sp_driver.connected)
-        check.is_false(sp_driver.connected)
+    check.is_false(sp_driver.connected)
     check.is_in("Splunk connection", mp_ex.value.args)
 
     sp_driver = SplunkDriver()
-    print("connected", sp_driver.connected)
     with pytest.raises(MsticpyConnectionError) as mp_ex:
         # [SuppressMessage("Microsoft.Security", "CS002:SecretInNextLine", Justification="Test code")]
         sp_driver.connect(
             host="HTTPError", username="ian", password=_FAKE_STRING
         )  # nosec
-        print("connected", sp_driver.connected)
-        check.is_false(sp_driver.connected)
+    check.is_false(sp_driver.connected)
     check.is_in("Splunk connection", mp_ex.value.args)
 
 
@@ -190,8 +186,8 @@ def test_splunk_fired_alerts(splunk_client):
     # trying to get these before connecting should throw
     with pytest.raises(MsticpyNotConnectedError) as mp_ex:
         sp_driver._get_fired_alerts()
-        check.is_false(sp_driver.connected)
-        check.is_none(sp_driver._fired_alerts)
+    check.is_false(sp_driver.connected)
+    check.is_none(sp_driver._fired_alerts)
     check.is_in("not connected to Splunk.", mp_ex.value.args)
 
     # [SuppressMessage("Microsoft.Security", "CS002:SecretInNextLine", Justification="Test code")]
@@ -213,8 +209,8 @@ def test_splunk_saved_searches(splunk_client):
     # trying to get these before connecting should throw
     with pytest.raises(MsticpyNotConnectedError) as mp_ex:
         sp_driver._get_saved_searches()
-        check.is_false(sp_driver.connected)
-        check.is_none(sp_driver._saved_searches)
+    check.is_false(sp_driver.connected)
+    check.is_none(sp_driver._saved_searches)
     check.is_in("not connected to Splunk.", mp_ex.value.args)
 
     # [SuppressMessage("Microsoft.Security", "CS002:SecretInNextLine", Justification="Test code")]
@@ -245,7 +241,7 @@ def test_splunk_query_success(splunk_client, splunk_results):
     # trying to get these before connecting should throw
     with pytest.raises(MsticpyNotConnectedError) as mp_ex:
         sp_driver.query("some query")
-        check.is_false(sp_driver.connected)
+    check.is_false(sp_driver.connected)
     check.is_in("not connected to Splunk.", mp_ex.value.args)
 
     # [SuppressMessage("Microsoft.Security", "CS002:SecretInNextLine", Justification="Test code")]
@@ -4,11 +4,42 @@
 # license information.
 # --------------------------------------------------------------------------
 """domain_utilstes extract test class."""
+from concurrent.futures import ThreadPoolExecutor
+import time
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
 import pytest_check as check
 
 from msticpy.sectools import domain_utils
 
 
+_ABUSE_CSV = "\n".join(
+    [f"# header line {idx}" for idx in range(8)]
+    + [
+        "# Listingdate,SHA1,Listingreason",
+        "2021-01-01 00:00:00,ABCDEF0123456789ABCDEF0123456789ABCDEF01,C&C",
+        "2021-01-02 00:00:00,junk,C&C",
+        "2021-01-03 00:00:00,,C&C",
+    ]
+)
+
+
+@pytest.fixture
+def abuse_list_state(monkeypatch):
+    """Reset the DomainValidator SSL abuse list load state."""
+    for attr, value in (
+        ("_loaded", False),
+        ("_load_failed_at", None),
+        ("_ssl_abuse_csv", ""),
+        ("_ssl_abuse_list", None),
+        ("_ssl_abuse_set", frozenset()),
+        ("_ssl_abuse_set_hex", frozenset()),
+    ):
+        monkeypatch.setattr(domain_utils.DomainValidator, attr, value)
+
+
 def test_validate_domain():
     test_dom_val = domain_utils.DomainValidator()
     valid_tld = test_dom_val.validate_tld("www.microsoft.com")
@@ -50,3 +81,352 @@ def test_resolver_funcs():
     result = domain_utils.url_components("http://www.microsoft.com")
     check.equal(result["scheme"], "http")
     check.equal(result["host"], "www.microsoft.com")
+
+
+@pytest.mark.usefixtures("abuse_list_state")
+def test_abuse_list_index(monkeypatch):
+    """Test SSL abuse list SHA1 index."""
+    monkeypatch.setattr(
+        domain_utils.DomainValidator,
+        "_get_ssl_abuselist_csv",
+        classmethod(lambda cls: _ABUSE_CSV),
+    )
+    domain_utils.DomainValidator._check_and_load_abuselist()
+    check.equal(
+        domain_utils.DomainValidator._ssl_abuse_set,
+        frozenset({bytes.fromhex("abcdef0123456789abcdef0123456789abcdef01")}),
+    )
+    check.is_true(domain_utils.DomainValidator._loaded)
+    check.is_none(domain_utils.DomainValidator._ssl_abuse_list)
+    abuse_list = domain_utils.DomainValidator().ssl_abuse_list
+    check.equal(len(abuse_list), 3)
+    check.is_in("SHA1", abuse_list.columns)
+
+    sha1_series = pd.Series(
+        ["ABCDEF0123456789ABCDEF0123456789ABCDEF01", "0" * 40, None]
+    )
+    check.equal(
+        list(domain_utils.DomainValidator.mark_in_abuse_list(sha1_series)),
+        [True, False, False],
+    )
+    # all-null and empty series are not string dtype
+    nan_result = domain_utils.DomainValidator.mark_in_abuse_list(
+        pd.Series([float("nan")] * 2)
+    )
+    check.equal(nan_result.dtype, bool)
+    check.equal(list(nan_result), [False, False])
+    check.equal(
+        len(
+            domain_utils.DomainValidator.mark_in_abuse_list(pd.Series([], dtype=float))
+        ),
+        0,
+    )
+
+
+def test_dns_resolve_df(monkeypatch):
+    """Test batch DNS resolution to DataFrame."""
+    responses = {
+        "www.contoso.com": {
+            "qname": "www.contoso.com",
+            "rrset": ["1.2.3.4", "1.2.3.5"],
+        },
+        "www.contoso.garbage": {"qname": "www.contoso.garbage", "response": "NXDOMAIN"},
+    }
+    monkeypatch.setattr(
+        domain_utils, "dns_resolve", lambda url_domain, rec_type: responses[url_domain]
+    )
+    result = domain_utils.dns_resolve_df("www.contoso.com")
+    check.equal(len(result), 2)
+    check.equal(list(result["rrset"]), ["1.2.3.4", "1.2.3.5"])
+    check.equal(list(result["qname"]), ["www.contoso.com"] * 2)
+    result = domain_utils.dns_resolve_df(list(responses))
+    check.equal(len(result), 3)
+    check.equal(result["qname"].nunique(), 2)
+    result = domain_utils.dns_resolve_df(["www.contoso.garbage"])
+    check.equal(len(result), 1)
+    check.is_not_in("rrset", result.columns)
+
+
+def test_dns_resolve_bulk():
+    """Test concurrent DNS resolution."""
+    domains = ["www.contoso.garbage", "http://www.fabrikam.garbage/path"]
+    results = domain_utils.dns_resolve_bulk(domains, concurrency=1)
+    check.equal(len(results), 2)
+    check.equal(
+        [res["qname"] for res in results],
+        ["www.contoso.garbage", "www.fabrikam.garbage"],
+    )
+    check.is_false(any(res.get("rrset") for res in results))
+
+    results_df = domain_utils.dns_resolve_bulk_df(domains)
+    check.equal(len(results_df), 2)
+
+    with pytest.raises(ValueError):
+        domain_utils.dns_resolve_bulk(domains, concurrency=0)
+
+
+def test_abuse_list_cache(monkeypatch, tmp_path):
+    """Test SSL abuse list is downloaded to and read from the cache."""
+    cache_file = tmp_path.joinpath("cache", "sslblacklist.csv")
+    monkeypatch.setattr(domain_utils.DomainValidator, "_SSL_ABUSE_CACHE", cache_file)
+    resp = MagicMock()
+    resp.text = _ABUSE_CSV
+    monkeypatch.setattr(domain_utils.requests, "get", MagicMock(return_value=resp))
+
+    abuse_csv = domain_utils.DomainValidator._get_ssl_abuselist_csv()
+    check.equal(abuse_csv, _ABUSE_CSV)
+    check.is_true(cache_file.is_file())
+    check.equal(domain_utils.requests.get.call_count, 1)
+
+    # second call should be served from the cache
+    abuse_csv = domain_utils.DomainValidator._get_ssl_abuselist_csv()
+    check.equal(abuse_csv, _ABUSE_CSV)
+    check.equal(domain_utils.requests.get.call_count, 1)
+
+
+def _bs_response(content):
+    resp = MagicMock()
+    resp.json.return_value = content
+    resp.status_code = 200
+    return resp
+
+
+def test_screenshot_polling(monkeypatch):
+    """Test screenshot polls for status with backoff."""
+    responses = [
+        _bs_response({"id": 1234}),
+        _bs_response({"status": "in_queue"}),
+        _bs_response({"status": "processing"}),
+        _bs_response({"status": "finished"}),
+        _bs_response({}),
+    ]
+    mock_session = MagicMock()
+    mock_session.get.side_effect = responses
+    monkeypatch.setattr(domain_utils, "_bs_session", None)
+    mock_sleep = MagicMock()
+    monkeypatch.setattr(
+        domain_utils.requests, "Session", MagicMock(return_value=mock_session)
+    )
+    monkeypatch.setattr(domain_utils.time, "sleep", mock_sleep)
+
+    image_data = domain_utils.screenshot("www.contoso.com", api_key="12345")
+    check.equal(image_data, responses[-1])
+    check.equal(mock_session.get.call_count, 5)
+    check.equal(domain_utils.requests.Session.call_count, 1)
+
+    # subsequent screenshots reuse the same session
+    mock_session.get.side_effect = [
+        _bs_response({"id": 1235}),
+        _bs_response({"status": "finished"}),
+        _bs_response({}),
+    ]
+    domain_utils.screenshot("www.fabrikam.com", api_key="12345")
+    check.equal(domain_utils.requests.Session.call_count, 1)
+    check.equal(
+        [call.args[0] for call in mock_sleep.call_args_list],
+        [domain_utils._BS_POLL_MIN_DELAY, domain_utils._BS_POLL_MIN_DELAY * 2],
+    )
+
+
+def test_validate_tld_precheck():
+    """Test validate_tld rejects IP addresses and dotless names."""
+    for value in ("", "localhost", "10.1.2.3", "fe80::1", "::ffff:10.1.2.3"):
+        check.is_false(domain_utils.DomainValidator.validate_tld(value))
+    check.is_true(domain_utils.DomainValidator.validate_tld("www.microsoft.com"))
+
+
+def test_url_components_cached():
+    """Test url_components with cached URL parsing."""
+    url = "https://www.contoso.com:8443/path?q=1"
+    result = domain_utils.url_components(url)
+    check.equal(result["host"], "www.contoso.com")
+    check.equal(result["port"], 8443)
+    result["host"] = "changed"
+    check.equal(domain_utils.url_components(url)["host"], "www.contoso.com")
+    check.equal(domain_utils.url_components("http://[bad-url"), {})
+
+
+@pytest.mark.usefixtures("abuse_list_state")
+def test_abuse_list_single_load(monkeypatch):
+    """Test concurrent callers only load the SSL abuse list once."""
+    load_count = []
+
+    def _get_abuse_csv(cls):
+        load_count.append(1)
+        time.sleep(0.1)
+        return _ABUSE_CSV
+
+    monkeypatch.setattr(
+        domain_utils.DomainValidator,
+        "_get_ssl_abuselist_csv",
+        classmethod(_get_abuse_csv),
+    )
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in range(8):
+            executor.submit(domain_utils.DomainValidator._check_and_load_abuselist)
+    check.equal(len(load_count), 1)
+    check.equal(len(domain_utils.DomainValidator._ssl_abuse_set), 1)
+
+
+def test_resolve_resp_to_dict():
+    """Test conversion of resolver response to dict."""
+    resp = MagicMock()
+    resp.qname = "www.contoso.com."
+    resp.rdtype = MagicMock()
+    resp.rdtype.name = "A"
+    resp.rdclass = 1
+    resp.rrset = ["1.2.3.4", "1.2.3.5"]
+    resp.expiration = 1600000000
+    result = domain_utils._resolve_resp_to_dict(resp)
+    check.equal(result["rdtype"], "A")
+    check.equal(result["rdclass"], "1")
+    check.equal(result["rrset"], ["1.2.3.4", "1.2.3.5"])
+
+
+@pytest.mark.usefixtures("abuse_list_state")
+def test_validate_many(monkeypatch):
+    """Test combined validation of multiple domains."""
+    domains = ["www.contoso.com", "www.fabrikam.com", "www.contoso.garbage"]
+    monkeypatch.setattr(
+        domain_utils.DomainValidator,
+        "is_resolvable",
+        staticmethod(lambda url_domain: url_domain.endswith(".com")),
+    )
+    cert_checked = []
+
+    def _cert_in_abuse_list(cls, url_domain):
+        cert_checked.append(url_domain)
+        return url_domain == "www.fabrikam.com", None
+
+    monkeypatch.setattr(
+        domain_utils.DomainValidator,
+        "_cert_in_abuse_list",
+        classmethod(_cert_in_abuse_list),
+    )
+    monkeypatch.setattr(domain_utils.DomainValidator, "_loaded", True)
+    results = domain_utils.DomainValidator.validate_many(domains)
+    check.equal(list(results["domain"]), domains)
+    check.equal(list(results["tld_valid"]), [True, True, False])
+    check.equal(list(results["resolvable"]), [True, True, False])
+    check.equal(list(results["in_abuse_list"]), [False, True, False])
+    check.equal(sorted(cert_checked), ["www.contoso.com", "www.fabrikam.com"])
+
+
+@pytest.mark.usefixtures("abuse_list_state")
+def test_validate_many_resolvable_matches(monkeypatch):
+    """Test validate_many resolvable column agrees with is_resolvable."""
+    monkeypatch.setattr(
+        domain_utils.DomainValidator,
+        "_cert_in_abuse_list",
+        classmethod(lambda cls, url_domain: (False, None)),
+    )
+    monkeypatch.setattr(domain_utils.DomainValidator, "_loaded", True)
+    domains = ["localhost", "www.contoso.garbage"]
+    results = domain_utils.DomainValidator.validate_many(domains)
+    check.equal(
+        list(results["resolvable"]),
+        [domain_utils.DomainValidator.is_resolvable(dom) for dom in domains],
+    )
+
+
+def test_make_progress(monkeypatch):
+    """Test progress widget is only created in IPython."""
+    monkeypatch.setattr(domain_utils, "is_ipython", lambda: False)
+    progress = domain_utils._make_progress(10)
+    check.is_instance(progress, domain_utils._NoProgress)
+    progress.value = 5
+
+
+def test_is_resolvable_offline():
+    """Test is_resolvable with names that do not need a DNS server."""
+    check.is_true(domain_utils.DomainValidator.is_resolvable("localhost"))
+    check.is_false(domain_utils.DomainValidator.is_resolvable("www.contoso.garbage"))
+    check.is_false(domain_utils.DomainValidator.is_resolvable("bad..name"))
+
+
+def test_abuse_list_bad_cache(monkeypatch, tmp_path):
+    """Test an unreadable abuse list cache falls back to the download."""
+    cache_file = tmp_path.joinpath("sslblacklist.csv")
+    cache_file.write_bytes(b"\xff\xfe\xfa bad utf-8")
+    monkeypatch.setattr(domain_utils.DomainValidator, "_SSL_ABUSE_CACHE", cache_file)
+    resp = MagicMock()
+    resp.text = _ABUSE_CSV
+    monkeypatch.setattr(domain_utils.requests, "get", MagicMock(return_value=resp))
+
+    abuse_csv = domain_utils.DomainValidator._get_ssl_abuselist_csv()
+    check.equal(abuse_csv, _ABUSE_CSV)
+    check.equal(domain_utils.requests.get.call_count, 1)
+
+    # stale, unreadable cache and a failed download returns an empty list
+    cache_file.write_bytes(b"\xff\xfe\xfa bad utf-8")
+    monkeypatch.setattr(
+        domain_utils.DomainValidator, "_SSL_ABUSE_CACHE_TTL", domain_utils.timedelta(0)
+    )
+    monkeypatch.setattr(
+        domain_utils.requests,
+        "get",
+        MagicMock(side_effect=domain_utils.requests.ConnectionError),
+    )
+    check.equal(domain_utils.DomainValidator._get_ssl_abuselist_csv(), "")
+
+
+@pytest.mark.usefixtures("abuse_list_state")
+def test_abuse_list_load_retry(monkeypatch):
+    """Test a failed SSL abuse list load is retried after a delay."""
+    responses = ["", _ABUSE_CSV]
+    load_count = []
+
+    def _get_abuse_csv(cls):
+        load_count.append(1)
+        return responses[min(len(load_count), len(responses)) - 1]
+
+    monkeypatch.setattr(
+        domain_utils.DomainValidator,
+        "_get_ssl_abuselist_csv",
+        classmethod(_get_abuse_csv),
+    )
+    sha1_series = pd.Series(["ABCDEF0123456789ABCDEF0123456789ABCDEF01"])
+
+    check.equal(
+        list(domain_utils.DomainValidator.mark_in_abuse_list(sha1_series)), [False]
+    )
+    check.is_false(domain_utils.DomainValidator._loaded)
+    check.equal(len(domain_utils.DomainValidator().ssl_abuse_list), 0)
+
+    # no retry until the retry delay has passed
+    domain_utils.DomainValidator.mark_in_abuse_list(sha1_series)
+    check.equal(len(load_count), 1)
+
+    monkeypatch.setattr(domain_utils.DomainValidator, "_SSL_ABUSE_RETRY_DELAY", 0)
+    check.equal(
+        list(domain_utils.DomainValidator.mark_in_abuse_list(sha1_series)), [True]
+    )
+    check.equal(len(load_count), 2)
+    check.is_true(domain_utils.DomainValidator._loaded)
+    check.equal(len(domain_utils.DomainValidator().ssl_abuse_list), 3)
+
+
+def test_abuse_list_invalid_download(monkeypatch, tmp_path):
+    """Test a download that is not the abuse list is not cached or used."""
+    cache_file = tmp_path.joinpath("sslblacklist.csv")
+    monkeypatch.setattr(domain_utils.DomainValidator, "_SSL_ABUSE_CACHE", cache_file)
+    resp = MagicMock()
+    resp.text = "<html><body>Please log in to the proxy</body></html>"
+    monkeypatch.setattr(domain_utils.requests, "get", MagicMock(return_value=resp))
+
+    check.equal(domain_utils.DomainValidator._get_ssl_abuselist_csv(), "")
+    check.is_false(cache_file.is_file())
+
+    # a stale, valid cache is used instead of the invalid download
+    cache_file.write_text(_ABUSE_CSV, encoding="utf-8")
+    monkeypatch.setattr(
+        domain_utils.DomainValidator, "_SSL_ABUSE_CACHE_TTL", domain_utils.timedelta(0)
+    )
+    check.equal(domain_utils.DomainValidator._get_ssl_abuselist_csv(), _ABUSE_CSV)
+    check.equal(cache_file.read_text(encoding="utf-8"), _ABUSE_CSV)
+
+    # a valid download replaces the cache without leaving a temp file
+    resp.text = _ABUSE_CSV.replace("ABCDEF01,", "ABCDEF02,")
+    check.equal(domain_utils.DomainValidator._get_ssl_abuselist_csv(), resp.text)
+    check.equal(cache_file.read_text(encoding="utf-8"), resp.text)
+    check.equal([path.name for path in tmp_path.iterdir()], ["sslblacklist.csv"])